@@ -0,0 +1,187 @@
+"""Records incoming updates into gzip-compressed JSONL for offline load replay.
+
+Each line holds the arrival time and the update body with tokens and personal data redacted:
+- Values of REDACTED_KEYS are replaced with a placeholder, and of TEXT_KEYS too when asked.
+- Coordinates (TG location, VK geo) are zeroed, keeping the update structure valid for replay.
+- User and chat IDs are replaced with stable pseudonyms, so one user stays one user in the capture
+  (the salt is kept in '<capture>.salt', so appending recorders reuse it):
+  VK ID fields from PSEUDONYM_KEYS and the 'id' of every Telegram user or chat object,
+  wherever it is nested (forward_from, new_chat_members, via_bot, ...).
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import secrets
+import tempfile
+
+REDACTED = '***'
+
+REDACTED_KEYS = {'secret', 'token', 'access_token', 'access_key', 'first_name',
+                 'last_name', 'username', 'phone_number', 'email', 'title',
+                 'vcard', 'address'}
+
+TEXT_KEYS = {'text', 'caption'}
+
+COORDINATE_KEYS = {'latitude', 'longitude'}
+
+PSEUDONYM_KEYS = {'from_id', 'peer_id', 'user_id', 'owner_id', 'admin_author_id',
+                  'chat_id', 'member_id', 'liker_id'}
+
+TG_CHAT_TYPES = {'private', 'group', 'supergroup', 'channel'}
+
+
+def is_user_or_chat(data):
+    """Check whether dictionary is a Telegram user or chat object.
+
+    Args:
+        data (dict): Part of update body.
+
+    Returns:
+        bool: True for user or chat object.
+    """
+    return 'id' in data and ('is_bot' in data or
+                             data.get('type') in TG_CHAT_TYPES)
+
+
+def load_salt(path):
+    """Get salt stored next to capture or store new random one.
+
+    The salt is written to a temporary file and linked into place, so concurrent
+    recorders never see a created but still empty salt file.
+
+    Args:
+        path (str): Capture file path.
+
+    Raises:
+        Exception: If stored salt file is empty.
+
+    Returns:
+        str: Salt for ID pseudonyms.
+    """
+    salt_path = f"{path}.salt"
+    if not os.path.exists(salt_path):
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(salt_path)), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                file.write(secrets.token_hex(16))
+            os.link(temp_path, salt_path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp_path)
+
+    with open(salt_path, encoding='utf-8') as file:
+        salt = file.read().strip()
+    if not salt:
+        raise Exception(f"Salt file '{salt_path}' is empty. Remove it or "
+                        f"pass salt explicitly")
+    return salt
+
+
+class Recorder:
+    """Opt-in recorder of incoming updates.
+
+    Attributes:
+        path (str): Capture file path.
+        salt (str): Salt for ID pseudonyms.
+        redact_text (bool): Whether to redact message texts and captions.
+        file (gzip.GzipFile): Opened capture file.
+    """
+    def __init__(self, path, salt=None, redact_text=False):
+        """Class constructor.
+
+        Args:
+            path (str): Capture file path, usually *.jsonl.gz.
+            salt (str, optional): Salt for ID pseudonyms. Defaults to the salt stored
+                next to the capture, which is generated on the first run.
+            redact_text (bool): Whether to redact message texts and captions. Defaults to False,
+                because menu buttons are matched by text.
+        """
+        self.path = path
+        self.salt = salt or load_salt(path)
+        self.redact_text = redact_text
+        self.file = gzip.open(path, 'at', encoding='utf-8')
+
+    def record(self, update):
+        """Write update body with its arrival time.
+
+        Args:
+            update (dict): Request info with JSON 'body'.
+        """
+        body = self.redact(json.loads(update['body']))
+        self.file.write(json.dumps({'t': time.time(), 'body': body},
+                                   ensure_ascii=False) + '\n')
+
+    def redact(self, data):
+        """Redact tokens and personal data.
+
+        Args:
+            data (Any): Update body or its part.
+
+        Returns:
+            Any: Redacted copy of data.
+        """
+        if isinstance(data, list):
+            return [self.redact(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        user_or_chat = is_user_or_chat(data)
+        redacted = {}
+        for key, value in data.items():
+            if key in REDACTED_KEYS or (self.redact_text and key in TEXT_KEYS):
+                redacted[key] = REDACTED
+            elif key in COORDINATE_KEYS and isinstance(value, (int, float)):
+                redacted[key] = 0.
+            elif key == 'coordinates' and isinstance(value, str):
+                redacted[key] = '0 0'  # old VK API: "latitude longitude"
+            elif isinstance(value, int) and not isinstance(value, bool) and \
+                    (key in PSEUDONYM_KEYS or (key == 'id' and user_or_chat)):
+                redacted[key] = self.pseudonym(value)
+            else:
+                redacted[key] = self.redact(value)
+        return redacted
+
+    def pseudonym(self, value):
+        """Get stable pseudonym for ID keeping its sign.
+
+        Args:
+            value (int): User or chat ID.
+
+        Returns:
+            int: Pseudonym ID.
+        """
+        digest = hashlib.blake2b(f"{self.salt}:{abs(value)}".encode(),
+                                 digest_size=5).digest()
+        pseudonym = int.from_bytes(digest, 'big') or 1
+        return -pseudonym if value < 0 else pseudonym
+
+    def close(self):
+        """Flush and close capture file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read(path):
+    """Read capture file.
+
+    Args:
+        path (str): Capture file path.
+
+    Yields:
+        (float, str): Arrival time and update body as JSON string.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield record['t'], json.dumps(record['body'])
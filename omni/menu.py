@@ -0,0 +1,137 @@
+"""Registry of menu buttons with short interned IDs.
+
+Each (menu, button) pair gets a compact ID that fits into Telegram callback_data (64 bytes)
+and VK button payloads, and is resolved back with a dictionary lookup.
+IDs are derived from menu name and button label, so keyboards already sent to chats keep
+resolving to the same buttons after menus are added or reordered. The version prefix keeps
+them apart from old label-based callback data.
+"""
+
+import string
+import hashlib
+
+DEFAULT_MENU = 'default'
+
+ID_ALPHABET = string.digits + string.ascii_letters
+ID_PREFIX = '~1'
+ID_DIGEST_SIZE = 6
+
+
+def encode_id(number):
+    """Encode number into short ID.
+
+    Args:
+        number (int): Non-negative number.
+
+    Returns:
+        str: Base62 ID.
+    """
+    encoded = ''
+    while True:
+        number, digit = divmod(number, len(ID_ALPHABET))
+        encoded = ID_ALPHABET[digit] + encoded
+        if not number:
+            return encoded
+
+
+def make_id(button, menu=DEFAULT_MENU):
+    """Derive short ID of menu button from its menu name and label.
+
+    Args:
+        button (str): Button label.
+        menu (str): Menu name. Defaults to DEFAULT_MENU.
+
+    Returns:
+        str: Button ID.
+    """
+    digest = hashlib.blake2b(f"{menu}\0{button}".encode(),
+                             digest_size=ID_DIGEST_SIZE).digest()
+    return ID_PREFIX + encode_id(int.from_bytes(digest, 'big'))
+
+
+class MenuRegistry:
+    """Menus with buttons and their short IDs.
+
+    Attributes:
+        ids (dict): Button IDs by (menu, button).
+        buttons (dict): (menu, button) by button ID.
+        labels (dict): Button IDs by button label.
+    """
+    def __init__(self):
+        """Class constructor."""
+        self.ids = {}
+        self.buttons = {}
+        self.labels = {}
+
+    def __bool__(self):
+        return bool(self.ids)
+
+    def __contains__(self, button_id):
+        return button_id in self.buttons
+
+    def register(self, buttons, menu=DEFAULT_MENU):
+        """Register menu buttons and intern their IDs.
+
+        Args:
+            buttons (list(str)): Menu buttons.
+            menu (str): Menu name. Defaults to DEFAULT_MENU.
+
+        Raises:
+            Exception: If IDs of different buttons collide.
+        """
+        for button in buttons:
+            key = (menu, button)
+            if key in self.ids:
+                continue
+            button_id = make_id(button, menu)
+            if button_id in self.buttons:
+                raise Exception(f"Button '{button}' of menu '{menu}' has the "
+                                f"same ID as {self.buttons[button_id]}. "
+                                f"Rename one of them")
+            self.ids[key] = button_id
+            self.buttons[button_id] = key
+            self.labels.setdefault(button, []).append(button_id)
+
+    def get_id(self, button, menu=DEFAULT_MENU):
+        """Get ID of menu button.
+
+        Args:
+            button (str): Button label.
+            menu (str): Menu name. Defaults to DEFAULT_MENU.
+
+        Raises:
+            Exception: If button is not registered in menu.
+
+        Returns:
+            str: Button ID.
+        """
+        try:
+            return self.ids[(menu, button)]
+        except KeyError:
+            raise Exception(f"Button '{button}' is not registered in menu "
+                            f"'{menu}'. Call register_menu_buttons before")
+
+    def resolve(self, button_id):
+        """Get menu and button by ID.
+
+        Args:
+            button_id (str): Button ID.
+
+        Returns:
+            (str, str) | None: Menu name and button label or None for unknown ID.
+        """
+        return self.buttons.get(button_id)
+
+    def resolve_label(self, label):
+        """Get menu and button by label typed by user.
+
+        Args:
+            label (str): Button label.
+
+        Returns:
+            (str, str) | None: First registered menu with such button and button label or None.
+        """
+        button_ids = self.labels.get(label)
+        if not button_ids:
+            return None
+        return self.buttons[button_ids[0]]
@@ -1,6 +1,8 @@
 """Provides a unified interface for text-based bot operations across multiple messaging platforms by abstracting provider-specific implementations."""
 
-from omni import send, trigger
+import functools
+
+from omni import send, trigger, pool, menu
 
 
 class OMNI:
@@ -8,14 +10,17 @@ class OMNI:
    
     Attributes:
         provider (BaseProvider): Provider for bot actions.
+        recorder (capture.Recorder): Recorder of incoming updates or None.
     """
-    def __init__(self, provider):
+    def __init__(self, provider, recorder=None):
         """Class constructor.
         
         Args:
             provider (BaseProvider): Provider for bot actions.
+            recorder (capture.Recorder, optional): Recorder of incoming updates for load replay. Defaults to None.
         """
         self.provider = provider
+        self.recorder = recorder
 
     def set_default_action(self, func):
         """Setter for default provider action.
@@ -59,50 +64,95 @@ class OMNI:
         destination = self.provider.get_destination(update, context)
         return await self.provider.send(destination, send.MESSAGE, message)
 
-    async def send_menu(self, message, buttons, update, context):
+    def get_menu_button(self, update, context):
+        """Get menu and button pressed by user.
+
+        Args:
+            update (telegram.Update | dict): Request info.
+            context (telegram.ext.ContextTypes.DEFAULT_TYPE): Chat context.
+
+        Returns:
+            (str, str) | None: Menu name and button label or None if no menu button was pressed.
+        """
+        return self.provider.get_menu_button(update, context)
+
+    async def send_menu(self, message, buttons, update, context,
+                        menu_name=menu.DEFAULT_MENU):
         """Send menu with buttons
 
         Args:
             message (str): Text message.
-            buttons (set): Menu buttons.
+            buttons (list): Menu buttons.
             update (telegram.Update | dict): Request info.
             context (telegram.ext.ContextTypes.DEFAULT_TYPE): Chat context.
+            menu_name (str): Menu name used in register_menu_buttons. Defaults to menu.DEFAULT_MENU.
 
         Returns:
             Message object with sended message info.
         """
         destination = self.provider.get_destination(update, context)
         return await self.provider.send(destination, send.MENU,
-                                        message, buttons)
+                                        message, buttons, menu_name)
 
-    def register_menu_buttons(self, buttons):
+    def register_menu_buttons(self, buttons, lines=None,
+                              menu_name=menu.DEFAULT_MENU):
         """Method for registration inline buttons for menu.
 
         Args:
-            buttons (set): Menu buttons.
+            buttons (list): Menu buttons.
+            lines (int, optional): Keyboard lines. Defaults to None.
+            menu_name (str): Menu name, so menus can share button labels. Defaults to menu.DEFAULT_MENU.
         """
-        self.provider.register_menu_buttons(buttons, lines=None)
+        self.provider.register_menu_buttons(buttons, lines, menu_name)
 
-    def add(self, on, action, trigger_filter=None):
+    def add(self, on, action, trigger_filter=None, compute=None,
+            executor=pool.PROCESS):
         """Add action on specific trigger with optional filter.
 
+        If compute is passed, the action is CPU-bound: compute(who, what) runs
+        in an executor shared by the process and its result is passed to
+        action(update, context, result) on the event loop for sending.
+        Warm the executor up at startup with pool.start(executor).
+
         Args:
             on (str): Trigger type.
             action (Callable): Action.
             trigger_filter (Callable): Function-filter for trigger. Defaults to None.
+            compute (Callable, optional): Module-level function for heavy computations. Defaults to None.
+            executor (str): Executor type for compute, pool.PROCESS or pool.THREAD. Defaults to pool.PROCESS.
 
         Raises:
             Exception: If add menu trigger without registered menu buttons.
         """
-        if on == trigger.ON_MENU and not self.provider.menu_buttons:
+        if on == trigger.ON_MENU and not self.provider.menus:
             raise Exception(f"Trigger '{on}' is not allowed without "
                             f"registration of menu buttons. Call "
                             f"register_menu_buttons before")
+        if compute is not None:
+            action = self._offload(action, compute, executor)
         self.provider.add(on, action, trigger_filter)
         action_name = action.__qualname__.split('.')[-1]
         print(f"Trigger '{on}(filter={trigger_filter})' "
                          f"added with action '{action_name}'")
 
+    def _offload(self, action, compute, executor):
+        executor_pool = pool.get_pool(executor)
+        executor_pool.check(compute)
+
+        @functools.wraps(action)
+        async def offloaded(update, context):
+            who, what = self.get_who_what(update, context)
+            result = await executor_pool.run(compute, who, what)
+            return await action(update, context, result)
+
+        return offloaded
+
+    def shutdown(self):
+        """Close recorder and stop executors of CPU-bound actions. Executors are shared by the process, so call it on exit."""
+        if self.recorder is not None:
+            self.recorder.close()
+        pool.shutdown()
+
     def act(self, update, context):
         """Performs actions added by the add method.
 
@@ -113,4 +163,9 @@ class OMNI:
         Returns:
             dict: Status code.
         """
+        if self.recorder is not None:
+            try:
+                self.recorder.record(update)
+            except Exception as e:
+                print(f"Update is not recorded: {e}")
         return self.provider.act(update, context)
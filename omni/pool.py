@@ -0,0 +1,160 @@
+"""Provides managed executors for CPU-bound actions, so heavy computations do not block the event loop.
+
+Pickling contract for offloaded computations:
+- Only the compute function and its arguments cross the process boundary.
+- The compute function must be defined at module level (no lambdas or closures).
+- The arguments are the username/user ID and message text returned by get_who_what,
+  never the provider-specific update and context objects.
+- The returned value must be picklable and is passed back to the action on the event loop.
+
+Worker processes are started with 'forkserver', never forked from the running bot,
+because the bot process already runs threads (HTTP clients, servers) and forking it can deadlock.
+
+Pools are shared by all bots in the process. Warm them up once at startup with start(),
+because spawning workers blocks the caller; call shutdown() when the process exits.
+"""
+
+import os
+import asyncio
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, \
+    BrokenExecutor
+
+PROCESS = 'process'
+THREAD = 'thread'
+
+START_METHOD = 'forkserver'
+
+
+def _warm_up():
+    return os.getpid()
+
+
+class Pool:
+    """Lazily started executor sized to the available cores.
+
+    Attributes:
+        kind (str): Executor type, PROCESS or THREAD.
+        workers (int): Number of workers.
+        executor (concurrent.futures.Executor): Running executor or None.
+    """
+    def __init__(self, kind=PROCESS, workers=None):
+        """Class constructor.
+
+        Args:
+            kind (str): Executor type, PROCESS or THREAD. Defaults to PROCESS.
+            workers (int, optional): Number of workers. Defaults to the number of cores.
+
+        Raises:
+            Exception: If kind is unknown.
+        """
+        if kind not in (PROCESS, THREAD):
+            raise Exception(f"Unknown executor type '{kind}'")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+
+    def start(self, warm=True):
+        """Create executor and optionally warm up its workers, so the first action does not pay for spawning.
+
+        Args:
+            warm (bool): Whether to wait until all workers are spawned. Defaults to True.
+        """
+        if self.executor is None:
+            if self.kind == PROCESS:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(START_METHOD))
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers)
+            print(f"Started {self.kind} pool with {self.workers} workers")
+        if warm:
+            futures = [self.executor.submit(_warm_up)
+                       for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+
+    def check(self, func):
+        """Check that function can be sent to the executor.
+
+        Args:
+            func (Callable): Compute function.
+
+        Raises:
+            Exception: If function can not be pickled for the process pool.
+        """
+        if self.kind != PROCESS:
+            return
+        try:
+            pickle.dumps(func)
+        except Exception as e:
+            raise Exception(f"Compute function '{func.__qualname__}' can not "
+                            f"be pickled for process pool. Define it at "
+                            f"module level") from e
+
+    async def run(self, func, *args):
+        """Run function in executor and wait for result on the event loop.
+
+        If a worker died (OOM, segfault), the broken executor is replaced with a new one,
+        so later actions keep working.
+
+        Args:
+            func (Callable): Compute function.
+            *args: Picklable arguments.
+
+        Raises:
+            concurrent.futures.BrokenExecutor: If a worker died while running this function.
+
+        Returns:
+            Any: Function result.
+        """
+        self.start(warm=False)
+        executor = self.executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenExecutor:
+            print(f"Broken {self.kind} pool is restarted")
+            if self.executor is executor:
+                self.shutdown()
+                self.start(warm=False)
+            raise
+
+    def shutdown(self):
+        """Stop executor and its workers."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+_pools = {}
+
+
+def get_pool(kind=PROCESS):
+    """Get pool shared by all bots in the process.
+
+    Args:
+        kind (str): Executor type, PROCESS or THREAD. Defaults to PROCESS.
+
+    Returns:
+        Pool: Shared pool.
+    """
+    if kind not in _pools:
+        _pools[kind] = Pool(kind)
+    return _pools[kind]
+
+
+def start(kind=PROCESS):
+    """Create and warm up shared pool. Call it at startup, outside request handling.
+
+    Args:
+        kind (str): Executor type, PROCESS or THREAD. Defaults to PROCESS.
+    """
+    get_pool(kind).start()
+
+
+def shutdown():
+    """Stop all shared pools."""
+    for shared_pool in _pools.values():
+        shared_pool.shutdown()
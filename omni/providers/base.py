@@ -8,6 +8,8 @@ It establishes the core interface and shared functionality for:
 
 import traceback
 
+from omni import menu
+
 
 class BaseProvider:
     """Base class for all providers.
@@ -16,7 +18,7 @@ class BaseProvider:
         logger (Logger): Logger object.
         error_action (Callable): Action for errors.
         default_action (Callable): Default bot action.
-        menu_buttons (Set[str]): Inline menu buttons.
+        menus (MenuRegistry): Inline menu buttons with their short IDs.
     """
     DEFAULT_KEYBOARD_LINES = 3
 
@@ -25,16 +27,19 @@ class BaseProvider:
         print(f"Initialized '{self.__module__}' Provider")
         self.error_action = None
         self.default_action = None
-        self.menu_buttons = set()  # strings
+        self.menus = menu.MenuRegistry()
         self.keyboard_lines = None
 
-    def register_menu_buttons(self, buttons, lines=None):
+    def register_menu_buttons(self, buttons, lines=None,
+                              menu_name=menu.DEFAULT_MENU):
         """Method for registration inline buttons for menu.
 
         Args:
-            buttons (set(str)): menu buttons.
+            buttons (list(str)): menu buttons.
+            lines (int, optional): Keyboard lines. Defaults to None.
+            menu_name (str): Menu name. Defaults to menu.DEFAULT_MENU.
         """
-        self.menu_buttons.update(buttons)
+        self.menus.register(buttons, menu_name)
         self.keyboard_lines = lines or self.DEFAULT_KEYBOARD_LINES
 
     def _error(self, update, context):
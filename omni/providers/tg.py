@@ -16,6 +16,7 @@ from telegram import Update
 from telegram.constants import ParseMode
 
 from omni import send, trigger
+from omni.menu import DEFAULT_MENU
 
 from omni.providers.base import BaseProvider
 
@@ -26,26 +27,31 @@ class TG(BaseProvider):
     Attributes:
         TYPE (str): Type of bot.
         TOKEN (str): The group's access key.
+        API_URL (str): Bot API url.
         app (telegram.ext.Application): Application.
         actions_to_handlers (dict): Actions for each trigger.
     """
     TYPE = "TG"
     TOKEN = os.environ["TOKEN"]  # Ключ доступа группы
+    API_URL = "https://api.telegram.org/bot"
 
     def __init__(self):
         """Class constructor"""
         super().__init__()
-        self.app = ApplicationBuilder().token(os.environ["TOKEN"]).build()
+        self.app = ApplicationBuilder().token(os.environ["TOKEN"]) \
+            .base_url(self.API_URL).build()
         self.actions_to_handlers = defaultdict(list)
 
-    async def send(self, who, type, text, buttons=None):
+    async def send(self, who, type, text, buttons=None,
+                   menu_name=DEFAULT_MENU):
         """Send different types of messages.
 
         Args:
             who (dict): Dictionary with message destinations.
             type (str): Type of message.
             text (str): Message text.
-            buttons (set(str), optional): Menu buttons. Defaults to None.
+            buttons (list(str), optional): Menu buttons. Defaults to None.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Raises:
             Exception: If type is not in send.py.
@@ -57,7 +63,7 @@ class TG(BaseProvider):
         if type == send.MESSAGE:
             return await self.message(who[send.MESSAGE], text)
         elif type == send.MENU:
-            return await self.menu(who[send.MENU], text, buttons)
+            return await self.menu(who[send.MENU], text, buttons, menu_name)
         else:
             raise Exception(f"Unknown type {type}")
 
@@ -81,27 +87,30 @@ class TG(BaseProvider):
             text=text,
             parse_mode=ParseMode.HTML)
 
-    async def menu(self, who, text, buttons):
+    async def menu(self, who, text, buttons, menu_name=DEFAULT_MENU):
         """Send message with menu buttons.
 
         Args:
             who (telegram.Message): The message included in the update.
             text (str): Message to sent.
-            buttons (set(str)): Menu buttons.
+            buttons (list(str)): Menu buttons.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Returns:
             telegram.Message: Message, chat and user info.
         """
         print(f"send menu: {who, text, buttons}")
         return await who.reply_text(text,
-                                    reply_markup=self.get_keyboard(buttons),
+                                    reply_markup=self.get_keyboard(buttons,
+                                                               menu_name),
                                     parse_mode=ParseMode.MARKDOWN)
 
-    def get_keyboard(self, buttons):
-        """Create button markup.
+    def get_keyboard(self, buttons, menu_name=DEFAULT_MENU):
+        """Create button markup with short button IDs as callback data.
 
         Args:
-            buttons (set(str)): Button names.
+            buttons (list(str)): Button names.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Returns:
             telegram.InlineKeyboardMarkup: Button markup.
@@ -111,13 +120,27 @@ class TG(BaseProvider):
         for start_index in range(0, len(buttons), self.keyboard_lines - 1):
             keyboard_line = []
             for key in buttons[start_index:start_index + self.keyboard_lines-1]:
-                button = InlineKeyboardButton(key, callback_data=key)
+                button = InlineKeyboardButton(
+                    key, callback_data=self.menus.get_id(key, menu_name))
                 keyboard_line.append(button)
             keyboard.append(keyboard_line)
         return InlineKeyboardMarkup(keyboard)
 
-    @staticmethod
-    def get_who_what(update, context):
+    def get_menu_button(self, update, context):
+        """Get menu and button pressed by user.
+
+        Args:
+            update (telegram.Update): Request info.
+            context (telegram.ext.ContextTypes.DEFAULT_TYPE): Chat context.
+
+        Returns:
+            (str, str) | None: Menu name and button label or None if no menu button was pressed.
+        """
+        if not update.callback_query:
+            return None
+        return self.menus.resolve(update.callback_query.data)
+
+    def get_who_what(self, update, context):
         """Get username and message text.
 
         Args:
@@ -130,6 +153,9 @@ class TG(BaseProvider):
         username = (update.message or update.effective_message).chat.username
 
         if update.callback_query:
+            menu_button = self.get_menu_button(update, context)
+            if menu_button is not None:
+                return username, menu_button[1]
             return username, update.callback_query.data
 
         message = (update.message or update.effective_message).text
@@ -213,8 +239,7 @@ class TG(BaseProvider):
                     return [await a(update, context) for a in menu_actions]
 
                 def filter_menu(data):
-                    print(f"We got '{data}' from {self.menu_buttons}")
-                    return data in self.menu_buttons
+                    return data in self.menus
 
                 handlers_to_add[1] = [CallbackQueryHandler(menu_func,
                                                            pattern=filter_menu)]
@@ -12,6 +12,7 @@ from collections import defaultdict
 import requests
 
 from omni import send, trigger
+from omni.menu import DEFAULT_MENU
 
 from omni.providers.base import BaseProvider
 
@@ -40,14 +41,16 @@ class VK(BaseProvider):
         self.actions = defaultdict(
             list)  # key = trigger or tuple(trigger, filter_func=None)
 
-    async def send(self, who, type, text, buttons=None):
+    async def send(self, who, type, text, buttons=None,
+                   menu_name=DEFAULT_MENU):
         """Send different types of messages.
 
         Args:
             who (dict): Dictionary with message destinations.
             type (str): Type of message.
             text (str): Message text.
-            buttons (set, optional): Menu buttons. Defaults to None.
+            buttons (list, optional): Menu buttons. Defaults to None.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Raises:
             Exception: If type is not in send.py.
@@ -59,17 +62,19 @@ class VK(BaseProvider):
         if type == send.MESSAGE:
             return self.message(who, text)
         elif type == send.MENU:
-            return self.message(who, text, buttons)
+            return self.message(who, text, buttons, menu_name)
         else:
             raise Exception(f"Unknown type {type}")
 
-    def message(self, destination, text, buttons=None):
+    def message(self, destination, text, buttons=None,
+                menu_name=DEFAULT_MENU):
         """Send text message with optional menu buttons.
 
         Args:
             destination (telegram.Message): The message included in the update.
             text (str): Message to sent.
-            buttons (set(str)): Menu buttons. Defaults to None.
+            buttons (list(str)): Menu buttons. Defaults to None.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Returns:
             requests.Response: Response of chat bot server.
@@ -83,7 +88,7 @@ class VK(BaseProvider):
             'dont_parse_links': 1,
         }
         if buttons:
-            kb = self.get_keyboard(buttons)
+            kb = self.get_keyboard(buttons, menu_name)
             params['keyboard'] = kb
             print(f"send message: {params}")
             params['keyboard'] = json.dumps(kb)
@@ -92,22 +97,29 @@ class VK(BaseProvider):
 
         return requests.post(self.VK_API_URL, params=params)
 
-    def _get_button(self, text):
-        return {"action": {"type": "text", "label": text}, "color": "primary"}
+    PAYLOAD_BUTTON_KEY = 'b'
 
-    def get_keyboard(self, buttons):
+    def _get_button(self, text, menu_name=DEFAULT_MENU):
+        payload = {self.PAYLOAD_BUTTON_KEY: self.menus.get_id(text, menu_name)}
+        return {"action": {"type": "text", "label": text,
+                           "payload": json.dumps(payload)},
+                "color": "primary"}
+
+    def get_keyboard(self, buttons, menu_name=DEFAULT_MENU):
         """Generates a VK API-compatible keyboard layout for interactive message replies. 
 
         Args:
-            buttons (set(str)): Menu buttons.
+            buttons (list(str)): Menu buttons.
+            menu_name (str): Menu name. Defaults to DEFAULT_MENU.
 
         Returns:
-            dict: Dictionary with menu config and buttons.
+            dict: Dictionary with menu config and buttons with short button IDs in payloads.
         """
         lines = []
         for start_index in range(0, len(buttons), self.keyboard_lines - 1):
-            lines.append(list(buttons[start_index:
-                                      start_index + self.keyboard_lines - 1]))
+            lines.append([self._get_button(button, menu_name)
+                          for button in buttons[start_index:
+                                                start_index + self.keyboard_lines - 1]])
 
         return {"one_time": False, "inline": False, "buttons": lines}
 
@@ -130,12 +142,34 @@ class VK(BaseProvider):
         if reply_vk_type == self.SELF_REPLY_MESSAGE:
             return None
 
-        reply_text = self.get_who_what(update, context)[1]
-        if reply_text in self.menu_buttons:
+        if self.get_menu_button(update, context) is not None:
             return trigger.ON_MENU
 
         return self.VK_TYPE_TO_TRIGGER[reply_vk_type]
 
+    def get_menu_button(self, update, context):
+        """Get menu and button pressed by user.
+
+        Button is resolved by short ID from payload, or by label when user typed it.
+
+        Args:
+            update (dict): Request info.
+            context: Chat context.
+
+        Returns:
+            (str, str) | None: Menu name and button label or None if no menu button was pressed.
+        """
+        message = json.loads(update['body'])['object']['message']
+        payload = message.get('payload')
+        if payload:
+            try:
+                button_id = json.loads(payload).get(self.PAYLOAD_BUTTON_KEY)
+            except (ValueError, AttributeError):
+                button_id = None
+            if isinstance(button_id, str) and button_id in self.menus:
+                return self.menus.resolve(button_id)
+        return self.menus.resolve_label(message['text'])
+
     @staticmethod
     def get_who_what(update, context):
         """Get user ID and message text.
@@ -0,0 +1,308 @@
+"""Replays captured traffic against OMNI.act with local stand-in API servers and reports load metrics.
+
+Usage:
+    python -m omni.replay capture.jsonl.gz --provider vk --speed 10
+    python -m omni.replay capture.jsonl.gz --provider tg --rate 200 --bot mybot:setup
+
+The --bot function receives the OMNI object and registers the same actions and menus as the real bot.
+"""
+
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+import functools
+import importlib
+import threading
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from omni import capture, trigger
+from omni.omni import OMNI
+
+VK = 'vk'
+TG = 'tg'
+
+PERCENTILES = (50, 90, 99)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers bot API requests with minimal successful responses."""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8', errors='replace')
+        method = self.path.rstrip('/').split('/')[-1]
+        self._reply(self.server.answer(method, self._params(body)))
+
+    do_GET = do_POST
+
+    def _params(self, body):
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                return json.loads(body)
+            except ValueError:
+                return {}
+        return {k: v[0] for k, v in parse_qs(body).items()}
+
+    def _reply(self, data):
+        payload = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in for VK or Telegram bot API.
+
+    Attributes:
+        provider (str): Provider type, VK or TG.
+    """
+    daemon_threads = True
+
+    def __init__(self, provider):
+        """Class constructor.
+
+        Args:
+            provider (str): Provider type, VK or TG.
+        """
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.provider = provider
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def answer(self, method, params):
+        """Build API response.
+
+        Args:
+            method (str): API method.
+            params (dict): Request parameters.
+
+        Returns:
+            dict: API response.
+        """
+        if self.provider == VK:
+            return {'response': 1}
+        if method == 'getMe':
+            return {'ok': True, 'result': {'id': 1, 'is_bot': True,
+                                           'first_name': 'replay',
+                                           'username': 'replay_bot'}}
+        if method == 'sendMessage':
+            try:
+                chat_id = int(params.get('chat_id', 0))
+            except ValueError:
+                chat_id = 0
+            return {'ok': True, 'result': {'message_id': 1,
+                                           'date': int(time.time()),
+                                           'chat': {'id': chat_id,
+                                                    'type': 'private'},
+                                           'text': params.get('text', '')}}
+        return {'ok': True, 'result': True}
+
+    def start(self):
+        """Serve requests in background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+def echo(bot):
+    """Default bot for replay: answers every message with its text.
+
+    Args:
+        bot (OMNI): Bot to set up.
+    """
+    async def you_said(update, context):
+        who, what = bot.get_who_what(update, context)
+        return await bot.send_message(f"You [{who}] said '{what}'",
+                                      update, context)
+
+    bot.add(trigger.ON_MESSAGE, you_said)
+
+
+def load_bot_setup(spec):
+    """Import bot setup function.
+
+    Args:
+        spec (str): Function path 'module:function'.
+
+    Returns:
+        Callable: Function that registers actions on OMNI object.
+    """
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name),
+                   function_name or 'setup')
+
+
+def count_errors(bot, errors):
+    """Collect exceptions of bot actions, because providers catch them and still answer 200.
+
+    Must be called before actions are added.
+
+    Args:
+        bot (OMNI): Bot.
+        errors (list): List to append exceptions to.
+    """
+    provider_add = bot.provider.add
+
+    def add(on, action, trigger_filter=None):
+        @functools.wraps(action)
+        async def counted(update, context):
+            try:
+                return await action(update, context)
+            except Exception as e:
+                errors.append(e)
+                raise
+
+        provider_add(on, counted, trigger_filter)
+
+    bot.provider.add = add
+
+
+def create_bot(provider, api_url, setup, errors):
+    """Create bot with provider pointed at stand-in server.
+
+    Args:
+        provider (str): Provider type, VK or TG.
+        api_url (str): Stand-in server url.
+        setup (Callable): Function that registers actions on OMNI object.
+        errors (list): List to append exceptions of actions to.
+
+    Returns:
+        OMNI: Bot.
+    """
+    if provider == VK:
+        from omni.providers.vk import VK as VKProvider
+        VKProvider.VK_API_URL = f"{api_url}/method/messages.send"
+        bot = OMNI(VKProvider())
+    else:
+        os.environ.setdefault('TOKEN', '0:replay')
+        from omni.providers.tg import TG as TGProvider
+        TGProvider.API_URL = f"{api_url}/bot"
+        bot = OMNI(TGProvider())
+    count_errors(bot, errors)
+    setup(bot)
+    return bot
+
+
+def percentile(values, p):
+    """Get nearest-rank percentile.
+
+    Args:
+        values (list(float)): Sorted values.
+        p (int): Percentile.
+
+    Returns:
+        float: Percentile value or 0 for empty values.
+    """
+    if not values:
+        return 0.
+    index = max(0, math.ceil(p / 100 * len(values)) - 1)
+    return values[index]
+
+
+async def _act(bot, body, due, latencies, lags, errors):
+    loop = asyncio.get_running_loop()
+    lags.append(loop.time() - due)
+    try:
+        result = await bot.act({'body': body}, None)
+        if not isinstance(result, dict) or result.get('statusCode') != 200:
+            errors.append(result)
+    except Exception as e:
+        errors.append(e)
+    latencies.append(loop.time() - due)
+
+
+async def replay(bot, records, speed=1., rate=None, errors=None):
+    """Feed captured updates into bot keeping their timing.
+
+    Latency is measured from the time an update was due, so it includes queueing
+    when the bot can not keep up; lag is the delay between due and actual send time.
+
+    Args:
+        bot (OMNI): Bot.
+        records (Iterable((float, str))): Arrival times and update bodies.
+        speed (float): Time acceleration; 0 sends as fast as possible. Defaults to 1.
+        rate (float, optional): Fixed target rate, updates per second; overrides speed. Defaults to None.
+        errors (list, optional): Errors collected by count_errors. Defaults to None.
+
+    Returns:
+        dict: Load metrics.
+    """
+    loop = asyncio.get_running_loop()
+    latencies, lags, tasks = [], [], []
+    errors = [] if errors is None else errors
+    first_time = None
+    start = loop.time()
+    for index, (arrival, body) in enumerate(records):
+        if first_time is None:
+            first_time = arrival
+        if rate:
+            delay = index / rate
+        elif speed:
+            delay = (arrival - first_time) / speed
+        else:
+            delay = 0
+        due = start + delay
+        wait = due - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        tasks.append(asyncio.create_task(
+            _act(bot, body, due, latencies, lags, errors)))
+    await asyncio.gather(*tasks)
+    duration = loop.time() - start
+
+    latencies.sort()
+    lags.sort()
+    report = {'updates': len(tasks),
+              'duration_s': duration,
+              'throughput_rps': len(tasks) / duration if duration else 0.,
+              'errors': len(errors)}
+    for p in PERCENTILES:
+        report[f'latency_p{p}_ms'] = percentile(latencies, p) * 1000
+    report['latency_max_ms'] = (latencies[-1] if latencies else 0.) * 1000
+    for p in PERCENTILES:
+        report[f'lag_p{p}_ms'] = percentile(lags, p) * 1000
+    return report
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('capture', help="Capture file written by capture.Recorder")
+    parser.add_argument('--provider', choices=(VK, TG), required=True)
+    parser.add_argument('--bot', help="Bot setup function 'module:function'. "
+                                      "Defaults to echo bot")
+    parser.add_argument('--speed', type=float, default=1.,
+                        help="Time acceleration, 0 for no pauses. Defaults to 1")
+    parser.add_argument('--rate', type=float,
+                        help="Fixed target rate, updates per second")
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.provider)
+    server.start()
+    try:
+        setup = load_bot_setup(args.bot) if args.bot else echo
+        errors = []
+        bot = create_bot(args.provider, server.url, setup, errors)
+        report = asyncio.run(replay(bot, capture.read(args.capture),
+                                    args.speed, args.rate, errors))
+        bot.shutdown()
+    finally:
+        server.shutdown()
+
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float)
+              else f"{key}: {value}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
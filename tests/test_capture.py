@@ -0,0 +1,147 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from omni import capture
+from omni.omni import OMNI
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    r = capture.Recorder(str(tmp_path / 'capture.jsonl.gz'), salt='test')
+    yield r
+    r.close()
+
+
+class ReplyingProvider:
+    async def act(self, update, context):
+        return {'statusCode': 200}
+
+
+def user(user_id):
+    return {'id': user_id, 'is_bot': False, 'first_name': 'Ivan',
+            'username': 'ivan'}
+
+
+@pytest.mark.parametrize('message, path', [
+    ({'forward_from': user(777)}, ['forward_from']),
+    ({'new_chat_members': [user(888)]}, ['new_chat_members', 0]),
+    ({'left_chat_member': user(999)}, ['left_chat_member']),
+    ({'via_bot': {'id': 555, 'is_bot': True, 'first_name': 'bot'}}, ['via_bot']),
+    ({'forward_from_chat': {'id': -100123, 'type': 'channel', 'title': 'News'}},
+     ['forward_from_chat']),
+    ({'reply_to_message': {'message_id': 5, 'forward_from': user(666)}},
+     ['reply_to_message', 'forward_from']),
+])
+def test_tg_user_and_chat_ids_are_pseudonymized(recorder, message, path):
+    body = {'update_id': 1, 'message': dict(message, message_id=10)}
+
+    redacted = recorder.redact(body)
+
+    original, obj = body['message'], redacted['message']
+    for key in path:
+        original, obj = original[key], obj[key]
+    assert obj['id'] == recorder.pseudonym(original['id'])
+    assert obj['id'] != original['id']
+    assert (obj['id'] < 0) == (original['id'] < 0)
+    assert redacted['message']['message_id'] == 10
+    assert redacted['update_id'] == 1
+
+
+@pytest.mark.parametrize('message, path, expected', [
+    ({'contact': {'phone_number': '+7900', 'first_name': 'Ivan', 'user_id': 1,
+                  'vcard': 'BEGIN:VCARD\nFN:Ivan Petrov\nTEL:+7900\nEND:VCARD'}},
+     ['contact', 'vcard'], capture.REDACTED),
+    ({'location': {'latitude': 55.75, 'longitude': 37.62}},
+     ['location', 'latitude'], 0.),
+    ({'location': {'latitude': 55.75, 'longitude': 37.62}},
+     ['location', 'longitude'], 0.),
+    ({'venue': {'location': {'latitude': 55.75, 'longitude': 37.62},
+                'title': 'Home', 'address': 'Tverskaya 1'}},
+     ['venue', 'address'], capture.REDACTED),
+    ({'geo': {'type': 'point', 'coordinates': {'latitude': 55.75,
+                                               'longitude': 37.62}}},
+     ['geo', 'coordinates', 'latitude'], 0.),
+    ({'geo': {'type': 'point', 'coordinates': '55.75 37.62'}},
+     ['geo', 'coordinates'], '0 0'),
+    ({'attachments': [{'type': 'photo', 'photo': {'id': 1, 'owner_id': 2,
+                                                  'access_key': 'abc'}}]},
+     ['attachments', 0, 'photo', 'access_key'], capture.REDACTED),
+])
+def test_personal_data_is_masked(recorder, message, path, expected):
+    redacted = recorder.redact({'message': message})['message']
+
+    for key in path:
+        redacted = redacted[key]
+    assert redacted == expected
+
+
+@pytest.mark.parametrize('key', ['text', 'caption'])
+def test_texts_are_masked_when_asked(tmp_path, key):
+    with capture.Recorder(str(tmp_path / 'capture.jsonl.gz'), salt='test',
+                          redact_text=True) as r:
+        assert r.redact({key: 'my address'})[key] == capture.REDACTED
+
+
+def test_names_and_secrets_are_masked(recorder):
+    body = {'type': 'message_new', 'secret': 'abc', 'object': {'message': {
+        'from_id': 123, 'peer_id': 123, 'text': 'hi'}}}
+
+    redacted = recorder.redact(body)
+
+    assert redacted['secret'] == capture.REDACTED
+    message = redacted['object']['message']
+    assert message['from_id'] == message['peer_id'] == recorder.pseudonym(123)
+    assert message['text'] == 'hi'
+    assert recorder.redact(user(1))['first_name'] == capture.REDACTED
+
+
+def test_flags_are_not_pseudonymized(recorder):
+    assert recorder.redact(user(1))['is_bot'] is False
+
+
+def test_appending_recorders_keep_pseudonyms(tmp_path):
+    path = str(tmp_path / 'capture.jsonl.gz')
+    body = json.dumps({'type': 'message_new', 'object': {'message': {
+        'from_id': 123, 'text': 'hi'}}})
+
+    for _ in range(2):
+        with capture.Recorder(path) as r:
+            r.record({'body': body})
+
+    first, second = [json.loads(b) for t, b in capture.read(path)]
+    assert first == second
+    assert first['object']['message']['from_id'] != 123
+
+
+def test_malformed_update_does_not_break_act(tmp_path):
+    path = str(tmp_path / 'capture.jsonl.gz')
+    provider = ReplyingProvider()
+    bot = OMNI(provider, recorder=capture.Recorder(path))
+
+    assert asyncio.run(bot.act({'body': 'not json'}, None)) == {'statusCode': 200}
+    assert asyncio.run(bot.act({'body': '{"n": 1}'}, None)) == {'statusCode': 200}
+    bot.shutdown()
+
+    assert [json.loads(b) for t, b in capture.read(path)] == [{'n': 1}]
+
+
+def test_concurrent_recorders_share_salt(tmp_path):
+    path = str(tmp_path / 'capture.jsonl.gz')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        salts = set(executor.map(capture.load_salt, [path] * 32))
+
+    assert len(salts) == 1
+    assert '' not in salts
+    assert [p.name for p in tmp_path.iterdir()] == ['capture.jsonl.gz.salt']
+
+
+def test_empty_salt_file_is_rejected(tmp_path):
+    path = str(tmp_path / 'capture.jsonl.gz')
+    open(f"{path}.salt", 'w').close()
+
+    with pytest.raises(Exception, match="empty"):
+        capture.load_salt(path)
@@ -0,0 +1,93 @@
+import os
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from omni import menu
+
+
+def test_ids_are_short_and_resolve_back():
+    registry = menu.MenuRegistry()
+    registry.register(["Self-diagnostic", "Запись на приём " * 10])
+
+    for button in ["Self-diagnostic", "Запись на приём " * 10]:
+        button_id = registry.get_id(button)
+        assert len(button_id.encode()) <= 64
+        assert registry.resolve(button_id) == (menu.DEFAULT_MENU, button)
+
+
+def test_menus_sharing_label_are_told_apart():
+    registry = menu.MenuRegistry()
+    registry.register(["Yes", "No"], "confirm")
+    registry.register(["Yes"], "subscribe")
+
+    assert registry.get_id("Yes", "confirm") != registry.get_id("Yes", "subscribe")
+    assert registry.resolve(registry.get_id("Yes", "subscribe")) == ("subscribe", "Yes")
+
+
+def test_ids_do_not_depend_on_registration_order():
+    first, second = menu.MenuRegistry(), menu.MenuRegistry()
+    first.register(["A", "B"], "one")
+    second.register(["C"], "two")
+    second.register(["B", "A"], "one")
+
+    assert first.get_id("A", "one") == second.get_id("A", "one")
+    assert first.get_id("B", "one") == second.get_id("B", "one")
+
+
+def test_old_label_callback_data_does_not_resolve():
+    registry = menu.MenuRegistry()
+    registry.register(["1", "2", "3"])
+
+    for data in ["0", "1", "2", "3"]:
+        assert data not in registry
+        assert registry.resolve(data) is None
+
+
+def test_colliding_ids_are_rejected(monkeypatch):
+    monkeypatch.setattr(menu, 'make_id', lambda button, menu_name: 'same')
+    registry = menu.MenuRegistry()
+    registry.register(["A"])
+
+    with pytest.raises(Exception, match="same ID"):
+        registry.register(["B"])
+
+
+def test_unknown_button_is_rejected():
+    registry = menu.MenuRegistry()
+    registry.register(["A"])
+
+    with pytest.raises(Exception, match="not registered"):
+        registry.get_id("A", "other")
+
+
+def test_vk_keyboard_round_trip():
+    pytest.importorskip('requests')
+    from omni.providers.vk import VK
+
+    vk = VK()
+    vk.register_menu_buttons(["Yes", "No"], menu_name="confirm")
+    vk.register_menu_buttons(["Yes"], menu_name="subscribe")
+    keyboard = vk.get_keyboard(["Yes"], "subscribe")
+    action = keyboard['buttons'][0][0]['action']
+
+    update = {'body': json.dumps({'type': 'message_new', 'object': {
+        'message': {'from_id': 1, 'text': action['label'],
+                    'payload': action['payload']}}})}
+    assert vk.get_menu_button(update, None) == ("subscribe", "Yes")
+
+
+def test_tg_keyboard_round_trip():
+    pytest.importorskip('telegram')
+    os.environ.setdefault('TOKEN', '0:test')
+    from omni.providers.tg import TG
+
+    tg = TG()
+    tg.register_menu_buttons(["Yes", "No"], menu_name="confirm")
+    tg.register_menu_buttons(["Yes"], menu_name="subscribe")
+    keyboard = tg.get_keyboard(["Yes", "No"], "confirm")
+    data = keyboard.inline_keyboard[0][1].callback_data
+
+    update = SimpleNamespace(callback_query=SimpleNamespace(data=data))
+    assert tg.get_menu_button(update, None) == ("confirm", "No")
@@ -0,0 +1,102 @@
+import os
+import asyncio
+from concurrent.futures import BrokenExecutor
+
+import pytest
+
+from omni import pool, trigger
+from omni.omni import OMNI
+
+
+def shout(who, what):
+    return f"{who}: {what.upper()}"
+
+
+def crash(who, what):
+    os._exit(1)
+
+
+class FakeProvider:
+    menus = {}
+
+    def __init__(self):
+        self.actions = []
+
+    def add(self, on, action, trigger_filter=None):
+        self.actions.append(action)
+
+    def get_who_what(self, update, context):
+        return update['who'], update['what']
+
+
+async def reply(update, context, result):
+    return result
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    monkeypatch.setattr(pool, '_pools', {})
+    b = OMNI(FakeProvider())
+    yield b
+    b.shutdown()
+
+
+@pytest.mark.parametrize('executor', [pool.PROCESS, pool.THREAD])
+def test_offloaded_result_is_passed_to_action(bot, executor):
+    bot.add(trigger.ON_MESSAGE, reply, compute=shout, executor=executor)
+    action = bot.provider.actions[0]
+
+    result = asyncio.run(action({'who': 1, 'what': 'hi'}, None))
+
+    assert result == "1: HI"
+    assert action.__qualname__ == reply.__qualname__
+
+
+def test_pools_are_shared_by_bots(bot):
+    other = OMNI(FakeProvider())
+    other.add(trigger.ON_MESSAGE, reply, compute=shout)
+    bot.add(trigger.ON_MESSAGE, reply, compute=shout)
+    update = {'who': 1, 'what': 'hi'}
+
+    asyncio.run(other.provider.actions[0](update, None))
+    executor = pool.get_pool(pool.PROCESS).executor
+    asyncio.run(bot.provider.actions[0](update, None))
+
+    assert executor is not None
+    assert pool.get_pool(pool.PROCESS).executor is executor
+    assert list(pool._pools) == [pool.PROCESS]
+
+
+def test_workers_are_not_forked():
+    shared_pool = pool.Pool(pool.PROCESS, workers=1)
+    shared_pool.start()
+    try:
+        assert shared_pool.executor._mp_context.get_start_method() == \
+            pool.START_METHOD
+    finally:
+        shared_pool.shutdown()
+
+
+def test_add_does_not_start_pool(bot):
+    bot.add(trigger.ON_MESSAGE, reply, compute=shout)
+
+    assert pool.get_pool(pool.PROCESS).executor is None
+
+
+def test_not_picklable_compute_is_rejected(bot):
+    with pytest.raises(Exception, match="can not be pickled"):
+        bot.add(trigger.ON_MESSAGE, reply, compute=lambda who, what: what)
+
+
+def test_broken_pool_is_restarted():
+    shared_pool = pool.Pool(pool.PROCESS, workers=1)
+
+    async def run_twice():
+        with pytest.raises(BrokenExecutor):
+            await shared_pool.run(crash, 1, 'hi')
+        return await shared_pool.run(shout, 1, 'hi')
+
+    try:
+        assert asyncio.run(run_twice()) == "1: HI"
+    finally:
+        shared_pool.shutdown()
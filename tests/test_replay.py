@@ -0,0 +1,71 @@
+import json
+import time
+import asyncio
+
+import pytest
+
+from omni import replay, trigger
+from omni.omni import OMNI
+
+
+@pytest.mark.parametrize('p, expected', [(0, 1), (20, 1), (50, 3), (90, 5),
+                                         (99, 5), (100, 5)])
+def test_percentile_is_nearest_rank(p, expected):
+    assert replay.percentile([1, 2, 3, 4, 5], p) == expected
+
+
+def test_percentile_of_no_values():
+    assert replay.percentile([], 50) == 0.
+
+
+class SwallowingProvider:
+    """Runs actions and answers 200 on failures, like VK and TG providers."""
+    menus = {}
+
+    def __init__(self):
+        self.actions = []
+
+    def add(self, on, action, trigger_filter=None):
+        self.actions.append(action)
+
+    async def act(self, update, context):
+        for action in self.actions:
+            try:
+                await action(update, context)
+            except Exception:
+                pass
+        return {'statusCode': 200}
+
+
+def test_failing_actions_are_counted_as_errors():
+    async def fail_on_odd(update, context):
+        if json.loads(update['body'])['n'] % 2:
+            raise ValueError("odd")
+
+    errors = []
+    bot = OMNI(SwallowingProvider())
+    replay.count_errors(bot, errors)
+    bot.add(trigger.ON_MESSAGE, fail_on_odd)
+    records = [(0., json.dumps({'n': n})) for n in range(6)]
+
+    report = asyncio.run(replay.replay(bot, records, speed=0, errors=errors))
+
+    assert report['updates'] == 6
+    assert report['errors'] == 3
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_latency_includes_queueing_behind_slow_actions():
+    async def slow(update, context):
+        time.sleep(0.01)  # blocks the loop like synchronous requests.post
+
+    bot = OMNI(SwallowingProvider())
+    bot.add(trigger.ON_MESSAGE, slow)
+    records = [(0., json.dumps({'n': n})) for n in range(50)]
+
+    report = asyncio.run(replay.replay(bot, records, rate=1000))
+
+    assert report['throughput_rps'] < 150
+    assert report['latency_p50_ms'] > 100
+    assert report['latency_p99_ms'] > 400
+    assert report['lag_p99_ms'] > 300